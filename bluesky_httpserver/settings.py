@@ -7,6 +7,7 @@ from typing import Any, List, Optional
 
 import pydantic
 from packaging import version
+from pydantic import Field
 
 if version.parse(pydantic.__version__) < version.parse("2.0.0"):
     from pydantic import BaseSettings
@@ -17,38 +18,62 @@ DatabaseSettings = collections.namedtuple("DatabaseSettings", "uri pool_size poo
 
 
 class Settings(BaseSettings):
+    # Defaults are computed from environment variables each time the settings are instantiated
+    #   (not when the module is imported), so that the app could be rebuilt in the same process.
     tree: Any = None
-    allow_anonymous_access: bool = bool(int(os.getenv("QSERVER_HTTP_SERVER_ALLOW_ANONYMOUS_ACCESS", False)))
-    allow_origins: List[str] = [
-        item for item in os.getenv("QSERVER_HTTP_SERVER_ALLOW_ORIGINS", "").split() if item
-    ]
+    allow_anonymous_access: bool = Field(
+        default_factory=lambda: bool(int(os.getenv("QSERVER_HTTP_SERVER_ALLOW_ANONYMOUS_ACCESS", False)))
+    )
+    allow_origins: List[str] = Field(
+        default_factory=lambda: [
+            item for item in os.getenv("QSERVER_HTTP_SERVER_ALLOW_ORIGINS", "").split() if item
+        ]
+    )
     authentication_provider_names: List[str] = []  # The list of authentication provider names
     authenticator: Any = None
     # These 'single user' settings are only applicable if authenticator is None.
-    single_user_api_key: str = os.getenv("QSERVER_HTTP_SERVER_SINGLE_USER_API_KEY", secrets.token_hex(32))
-    single_user_api_key_generated: bool = not ("QSERVER_HTTP_SERVER_SINGLE_USER_API_KEY" in os.environ)
+    single_user_api_key: str = Field(
+        default_factory=lambda: os.getenv("QSERVER_HTTP_SERVER_SINGLE_USER_API_KEY", secrets.token_hex(32))
+    )
+    single_user_api_key_generated: bool = Field(
+        default_factory=lambda: not ("QSERVER_HTTP_SERVER_SINGLE_USER_API_KEY" in os.environ)
+    )
     # The QSERVER_HTTP_SERVER_SERVER_SECRET_KEYS may be a single key or a ;-separated list of
     # keys to support key rotation. The first key will be used for encryption. Each
     # key will be tried in turn for decryption.
-    secret_keys: List[str] = os.getenv("QSERVER_HTTP_SERVER_SERVER_SECRET_KEYS", secrets.token_hex(32)).split(";")
-    access_token_max_age: timedelta = timedelta(
-        seconds=int(os.getenv("QSERVER_HTTP_SERVER_ACCESS_TOKEN_MAX_AGE", 15 * 60))  # 15 minutes
+    secret_keys: List[str] = Field(
+        default_factory=lambda: os.getenv("QSERVER_HTTP_SERVER_SERVER_SECRET_KEYS", secrets.token_hex(32)).split(
+            ";"
+        )
     )
-    refresh_token_max_age: timedelta = timedelta(
-        seconds=int(os.getenv("QSERVER_HTTP_SERVER_REFRESH_TOKEN_MAX_AGE", 7 * 24 * 60 * 60))  # 7 days
+    access_token_max_age: timedelta = Field(
+        default_factory=lambda: timedelta(
+            seconds=int(os.getenv("QSERVER_HTTP_SERVER_ACCESS_TOKEN_MAX_AGE", 15 * 60))  # 15 minutes
+        )
     )
-    session_max_age: Optional[timedelta] = timedelta(
-        seconds=int(os.getenv("QSERVER_HTTP_SERVER_SESSION_MAX_AGE", 365 * 24 * 60 * 60))  # 365 days
+    refresh_token_max_age: timedelta = Field(
+        default_factory=lambda: timedelta(
+            seconds=int(os.getenv("QSERVER_HTTP_SERVER_REFRESH_TOKEN_MAX_AGE", 7 * 24 * 60 * 60))  # 7 days
+        )
+    )
+    session_max_age: Optional[timedelta] = Field(
+        default_factory=lambda: timedelta(
+            seconds=int(os.getenv("QSERVER_HTTP_SERVER_SESSION_MAX_AGE", 365 * 24 * 60 * 60))  # 365 days
+        )
     )
     # Put a fairly low limit on the maximum size of one chunk, keeping in mind
     # that data should generally be chunked. When we implement async responses,
     # we can raise this global limit.
-    response_bytesize_limit: int = int(
-        os.getenv("QSERVER_HTTP_SERVER_RESPONSE_BYTESIZE_LIMIT", 300_000_000)
+    response_bytesize_limit: int = Field(
+        default_factory=lambda: int(os.getenv("QSERVER_HTTP_SERVER_RESPONSE_BYTESIZE_LIMIT", 300_000_000))
     )  # 300 MB
-    database_uri: Optional[str] = os.getenv("QSERVER_HTTP_SERVER_DATABASE_URI")
-    database_pool_size: Optional[int] = int(os.getenv("QSERVER_HTTP_SERVER_DATABASE_POOL_SIZE", 5))
-    database_pool_pre_ping: Optional[bool] = bool(int(os.getenv("QSERVER_HTTP_SERVER_DATABASE_POOL_PRE_PING", 1)))
+    database_uri: Optional[str] = Field(default_factory=lambda: os.getenv("QSERVER_HTTP_SERVER_DATABASE_URI"))
+    database_pool_size: Optional[int] = Field(
+        default_factory=lambda: int(os.getenv("QSERVER_HTTP_SERVER_DATABASE_POOL_SIZE", 5))
+    )
+    database_pool_pre_ping: Optional[bool] = Field(
+        default_factory=lambda: bool(int(os.getenv("QSERVER_HTTP_SERVER_DATABASE_POOL_PRE_PING", 1)))
+    )
 
     @property
     def database_settings(self):
@@ -1,21 +1,67 @@
+import asyncio
+import http.cookiejar
 import os
+import threading
 import time as ttime
 
+import httpx
 import pytest
-import requests
+import uvicorn
 from bluesky_queueserver.manager.comms import zmq_single_request
+from starlette.responses import PlainTextResponse
 from xprocess import ProcessStarter
 
 import bluesky_httpserver.server as bqss
+from bluesky_httpserver.settings import get_sessionmaker, get_settings
+
+# Name of pytest-xdist worker (e.g. 'gw0', 'gw1', ...) or None if the tests are not run in parallel.
+_xdist_worker = os.environ.get("PYTEST_XDIST_WORKER", None)
+
+
+def xdist_worker_port(port, worker_base_port):
+    """
+    Returns ``port`` if the tests are not run in parallel. Otherwise returns the port unique
+    for the pytest-xdist worker (``worker_base_port`` + worker number), so that each worker
+    could start its own server.
+    """
+    return worker_base_port + int(_xdist_worker[2:]) if _xdist_worker else port
+
+
+def xdist_worker_process_name(name):
+    """
+    Returns the name of the process managed by 'xprocess' unique for the pytest-xdist worker.
+    The process info is stored in the directory shared by all workers.
+    """
+    return f"{name}_{_xdist_worker}" if _xdist_worker else name
+
 
 SERVER_ADDRESS = "localhost"
-SERVER_PORT = "60610"
+# Worker ports start from 60710 to avoid conflicts with the ports used by RE Manager (60615, ...).
+SERVER_PORT = str(xdist_worker_port(60610, 60710))
+
+_xprocess_name = xdist_worker_process_name("fastapi_server")
 
 # Single-user API key used for most of the tests
 API_KEY_FOR_TESTS = "APIKEYFORTESTS"
 
 _user_group = "primary"
 
+# HTTP client used by 'request_to_json' by default. Connections to the server are kept alive
+#   between requests. Cookies are rejected, so that the requests remain independent.
+_http_client = httpx.Client(
+    cookies=http.cookiejar.CookieJar(policy=http.cookiejar.DefaultCookiePolicy(allowed_domains=[])),
+    timeout=None,
+)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _close_http_client():
+    """
+    Close the default HTTP client used by 'request_to_json' at the end of the session.
+    """
+    yield
+    _http_client.close()
+
 
 @pytest.fixture(scope="module")
 def fastapi_server(xprocess):
@@ -27,11 +73,11 @@ def fastapi_server(xprocess):
         args = f"uvicorn --host={SERVER_ADDRESS} --port {SERVER_PORT} {bqss.__name__}:app".split()
         # args = f"start-bluesky-httpserver --host={SERVER_ADDRESS} --port {SERVER_PORT}".split()
 
-    xprocess.ensure("fastapi_server", Starter)
+    xprocess.ensure(_xprocess_name, Starter)
 
     yield
 
-    xprocess.getinfo("fastapi_server").terminate()
+    xprocess.getinfo(_xprocess_name).terminate()
 
 
 @pytest.fixture
@@ -51,33 +97,208 @@ def fastapi_server_fs(xprocess):
             pattern = "Bluesky HTTP Server started successfully"
             args = f"uvicorn --host={http_server_host} --port {http_server_port} {bqss.__name__}:app".split()
 
-        xprocess.ensure("fastapi_server", Starter)
+        xprocess.ensure(_xprocess_name, Starter)
         ttime.sleep(1)
 
     yield start
 
-    xprocess.getinfo("fastapi_server").terminate()
+    xprocess.getinfo(_xprocess_name).terminate()
+
+
+class _ReloadableApp:
+    """
+    ASGI app that forwards requests to the app built from the current server configuration.
+    """
+
+    def __init__(self):
+        self.app = None
+
+    async def __call__(self, scope, receive, send):
+        if self.app is None:
+            response = PlainTextResponse("No app loaded", status_code=503)
+            await response(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+class _InProcessServer:
+    """
+    HTTP server running in a background thread of the test process. The app served by
+    the server is rebuilt from the current configuration (environment variables and config file)
+    by calling ``reload()``, which is much faster than restarting the server process.
+    """
+
+    def __init__(self, host, port):
+        self._app = _ReloadableApp()
+        # Startup and shutdown of the apps are performed in 'reload' and 'unload'.
+        config = uvicorn.Config(self._app, host=host, port=int(port), lifespan="off", log_level="warning")
+        self._server = uvicorn.Server(config)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_server, daemon=True)
+        self._lifespan = None
+        # Key of the configuration of the loaded app if the app may be reused by the next test.
+        self.config_key = None
+
+    def _run_server(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._server.serve())
+
+    def _run_coroutine(self, coro, timeout=10):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def start(self, timeout=10):
+        self._thread.start()
+        time_start = ttime.time()
+        while not self._server.started:
+            if ttime.time() > time_start + timeout:
+                raise TimeoutError("Timeout occurred while starting HTTP server")
+            ttime.sleep(0.01)
+
+    def stop(self, timeout=10):
+        self.unload()
+        self._server.should_exit = True
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            raise TimeoutError("Timeout occurred while stopping HTTP server")
+        self._loop.close()
+
+    def reload(self, config_key=None):
+        """
+        Build the app using current configuration and replace the app that is currently served.
+        If ``config_key`` is not None, the app is kept loaded after the test and may be reused
+        by the following tests with the same ``config_key``.
+        """
+        self.unload()
+        # Settings are cached and must be reloaded from the environment variables.
+        get_settings.cache_clear()
+        get_sessionmaker.cache_clear()
+        web_app = bqss.app_factory()
+        self._lifespan = self._run_coroutine(self._start_app(web_app))
+        self._app.app = web_app
+        self.config_key = config_key
+
+    def unload(self):
+        web_app, self._app.app = self._app.app, None
+        self.config_key = None
+        if web_app is not None:
+            self._run_coroutine(self._stop_app(web_app, self._lifespan))
+
+    @staticmethod
+    async def _start_app(web_app):
+        # Run startup handlers of the app using ASGI lifespan protocol.
+        receive_queue, send_queue = asyncio.Queue(), asyncio.Queue()
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}}
+        task = asyncio.create_task(web_app(scope, receive_queue.get, send_queue.put))
+        await receive_queue.put({"type": "lifespan.startup"})
+        message = await send_queue.get()
+        if message["type"] != "lifespan.startup.complete":
+            await asyncio.gather(task, return_exceptions=True)
+            raise RuntimeError(f"Failed to start HTTP server: {message.get('message', '')}")
+        return task, receive_queue, send_queue
+
+    @staticmethod
+    async def _stop_app(web_app, lifespan):
+        # Run shutdown handlers of the app and cancel background tasks started by the app.
+        task, receive_queue, send_queue = lifespan
+        await receive_queue.put({"type": "lifespan.shutdown"})
+        await send_queue.get()
+        await task
+        app_tasks = getattr(web_app.state, "tasks", [])
+        for app_task in app_tasks:
+            app_task.cancel()
+        await asyncio.gather(*app_tasks, return_exceptions=True)
+
+
+@pytest.fixture(scope="module")
+def fastapi_server_ms():
+    """
+    FastAPI server with module scope running in the test process. The server is not processing
+    requests until the app is loaded using ``server_with_config`` fixture.
+    """
+    server = _InProcessServer(SERVER_ADDRESS, SERVER_PORT)
+    server.start()
+
+    yield server
+
+    server.stop()
+
+
+@pytest.fixture(scope="module")
+def qserver_config_path(tmp_path_factory):
+    """
+    Path to the config file loaded by the module-scoped server (``fastapi_server_ms``).
+    The environment variable ``QSERVER_HTTP_SERVER_CONFIG`` is set once per module and
+    the configuration is changed by overwriting the file. The directory containing
+    the config file is set as a current directory.
+    """
+    config_path = tmp_path_factory.mktemp("config") / "config_httpserver.yml"
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("QSERVER_HTTP_SERVER_CONFIG", str(config_path))
+        mp.chdir(config_path.parent)
+        yield config_path
+
+
+@pytest.fixture
+def server_with_config(fastapi_server_ms, qserver_config_path, tmp_path_factory, monkeypatch):
+    """
+    Load the app with new configuration to the module-scoped server (``fastapi_server_ms``).
+    Should be used instead of ``fastapi_server_fs``: call ``server_with_config(config_file_str)``
+    in the unit test code. The server is started without config file if ``config_file_str``
+    is empty. A new database is created for each test that loads a config file.
+
+    If ``reuse=True``, the app is not rebuilt if it was loaded by the previous test with the same
+    configuration and ``reuse=True``. The reused app keeps the database of the previous test, so
+    this option should be used only by the tests that do not depend on the contents of the database.
+    """
+
+    def load(config_file_str="", *, api_key=API_KEY_FOR_TESTS, reuse=False):
+        config_key = (config_file_str, api_key)
+        if reuse and (fastapi_server_ms.config_key == config_key):
+            return
+
+        if api_key:
+            monkeypatch.setenv("QSERVER_HTTP_SERVER_SINGLE_USER_API_KEY", api_key)
+        if config_file_str:
+            print(f"SERVER CONFIGURATION:\n{'-' * 50}\n{config_file_str}\n{'-' * 50}")
+            qserver_config_path.write_text(config_file_str, encoding="utf-8")
+            sqlite_path = tmp_path_factory.mktemp("work") / "bluesky_httpserver.sqlite"
+            monkeypatch.setenv("QSERVER_HTTP_SERVER_DATABASE_URI", f"sqlite:///{sqlite_path}")
+        else:
+            monkeypatch.delenv("QSERVER_HTTP_SERVER_CONFIG")
+        fastapi_server_ms.reload(config_key=config_key if reuse else None)
+
+    yield load
+
+    if fastapi_server_ms.config_key is None:
+        fastapi_server_ms.unload()
+
+
+# Paths to config files created by 'setup_server_with_config_file', keyed by the file contents.
+#   Identical config files are created once per session and shared between tests.
+_CONFIG_CACHE = {}
 
 
-def setup_server_with_config_file(*, config_file_str, tmpdir, monkeypatch):
+def setup_server_with_config_file(*, config_file_str, tmp_path_factory, monkeypatch):
     """
-    Creates config file for the server in ``tmpdir/config/`` directory and
-    sets up the respective environment variable. Sets ``tmpdir`` as a current directory.
+    Creates config file for the server and sets up the respective environment variable.
+    The config file is created only once per session for each unique ``config_file_str``.
+    The database is created in a new temporary directory, which is set as a current directory.
     """
     print(f"SERVER CONFIGURATION:\n{'-' * 50}\n{config_file_str}\n{'-' * 50}")
-    config_fln = "config_httpserver.yml"
-    config_dir = os.path.join(tmpdir, "config")
-    config_path = os.path.join(config_dir, config_fln)
-    os.makedirs(config_dir)
-    with open(config_path, "wt") as f:
-        f.writelines(config_file_str)
+    config_path = _CONFIG_CACHE.get(config_file_str, None)
+    if config_path is None:
+        config_fln = "config_httpserver.yml"
+        config_dir = tmp_path_factory.mktemp("config")
+        config_path = config_dir / config_fln
+        config_path.write_text(config_file_str, encoding="utf-8")
+        _CONFIG_CACHE[config_file_str] = config_path
 
-    sqlite_path = os.path.join(tmpdir, "bluesky_httpserver.sqlite")
-    sqlite_path = "sqlite:///" + sqlite_path
+    work_dir = tmp_path_factory.mktemp("work")
+    sqlite_path = work_dir / "bluesky_httpserver.sqlite"
 
-    monkeypatch.setenv("QSERVER_HTTP_SERVER_CONFIG", config_path)
-    monkeypatch.setenv("QSERVER_HTTP_SERVER_DATABASE_URI", sqlite_path)
-    monkeypatch.chdir(tmpdir)
+    monkeypatch.setenv("QSERVER_HTTP_SERVER_CONFIG", str(config_path))
+    monkeypatch.setenv("QSERVER_HTTP_SERVER_DATABASE_URI", f"sqlite:///{sqlite_path}")
+    monkeypatch.chdir(work_dir)
 
     return config_path
 
@@ -100,7 +321,15 @@ def add_plans_to_queue():
 
 
 def request_to_json(
-    request_type, path, *, request_prefix="/api", api_key=API_KEY_FOR_TESTS, token=None, login=None, **kwargs
+    request_type,
+    path,
+    *,
+    request_prefix="/api",
+    api_key=API_KEY_FOR_TESTS,
+    token=None,
+    login=None,
+    client=None,
+    **kwargs,
 ):
     if login:
         auth = None
@@ -116,8 +345,8 @@ def request_to_json(
         headers = {"Authorization": f"ApiKey {api_key}"}
         kwargs.update({"auth": auth, "headers": headers})
 
-    method = getattr(requests, request_type)
-    resp = method(f"http://{SERVER_ADDRESS}:{SERVER_PORT}{request_prefix}{path}", **kwargs)
+    client = _http_client if client is None else client
+    resp = client.request(request_type, f"http://{SERVER_ADDRESS}:{SERVER_PORT}{request_prefix}{path}", **kwargs)
     resp = resp.json()
     return resp
 
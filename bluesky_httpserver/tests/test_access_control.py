@@ -1,8 +1,10 @@
 # Tests for user authorization and authentication on the working server
 import copy
 import pprint
+from dataclasses import dataclass
 
 import pytest
+import yaml
 from bluesky_queueserver.manager.tests.common import re_manager, re_manager_cmd  # noqa F401
 
 from bluesky_httpserver.authorization._defaults import (
@@ -19,221 +21,243 @@ from bluesky_httpserver.authorization._defaults import (
     _DEFAULT_SCOPES_SINGLE_USER,
 )
 
-from .conftest import fastapi_server_fs  # noqa: F401
-from .conftest import request_to_json, setup_server_with_config_file
-
-config_noauth_with_anonymous_access = """
-authentication:
-    allow_anonymous_access: True
-"""
-
-config_noauth_without_anonymous_access = """
-authentication:
-    allow_anonymous_access: False
-"""
-
-config_noauth_single_user_api_key = """
-authentication:
-    single_user_api_key: "apikeyfromconfig"
-"""
-
-config_noauth_single_user_api_key_as_ev = """
-authentication:
-    single_user_api_key: ${CUSTOM_EV_FOR_API_KEY}
-"""
-
-config_toy_with_anonymous_access = """
-authentication:
-    allow_anonymous_access: True
-    providers:
-        - provider: toy
-          authenticator: bluesky_httpserver.authenticators:DictionaryAuthenticator
-          args:
-              users_to_passwords:
-                  bob: bob_password
-                  alice: alice_password
-                  cara: cara_password
-                  tom: tom_password
-"""
-
-config_toy_without_anonymous_access = """
-authentication:
-    allow_anonymous_access: False
-    providers:
-        - provider: toy
-          authenticator: bluesky_httpserver.authenticators:DictionaryAuthenticator
-          args:
-              users_to_passwords:
-                  bob: bob_password
-                  alice: alice_password
-                  cara: cara_password
-                  tom: tom_password
-"""
-
-authorization_dict = """
-api_access:
-  policy: bluesky_httpserver.authorization:DictionaryAPIAccessControl
-  args:
-    users:
-      bob:
-        roles:
-          - admin
-          - expert
-      alice:
-        # A single role may be specified as a string or a list with one element.
-        roles: user
-      cara:
-        roles:
-          - observer
-"""
-
-config_noauth_modify_default_roles = f"""
-authentication:
-  allow_anonymous_access: True
-api_access:
-  policy: bluesky_httpserver.authorization:DictionaryAPIAccessControl
-  args:
-    roles:
-      {_DEFAULT_ROLE_SINGLE_USER}:
-        scopes_add:
-          - admin:apikeys
-          - admin:read:principals
-          - admin:metrics
-        scopes_remove:
-          - read:monitor
-      {_DEFAULT_ROLE_PUBLIC}:
-        scopes_set:
-          - read:status
-          - read:queue
-          - read:history
-"""
-
-authorization_modify_roles_for_users = f"""
-api_access:
-  policy: bluesky_httpserver.authorization:DictionaryAPIAccessControl
-  args:
-    users:
-      bob:
-        roles:
-          - admin
-          - expert
-      alice:
-        roles: user
-      cara:
-        roles:
-          - observer
-    roles:
-      {_DEFAULT_ROLE_ADMIN}:
-        scopes_add: read:queue
-        scopes_remove: admin:metrics
-      {_DEFAULT_ROLE_EXPERT}:
-        scopes_set:
-          - read:queue
-          - write:queue
-      {_DEFAULT_ROLE_USER}:
-        scopes_remove:
-          - read:console
-          - read:testing
-      {_DEFAULT_ROLE_OBSERVER}:
-        scopes_add:
-          - write:queue
-"""
-
-authorization_define_new_role = """
-api_access:
-  policy: bluesky_httpserver.authorization:DictionaryAPIAccessControl
-  args:
-    users:
-      bob:
-        roles:
-          - admin
-          - expert
-      alice:
-        roles:
-          - observer
-          - new_role1
-      cara:
-        roles: new_role2
-      tom: null  # Same as if tom was not listed: tom can not log into the server.
-    roles:
-      # The new roles are identical, one is created using 'scope_set', the other using 'scope_add'.
-      #   Both methods should work identically.
-      new_role1:
-        scopes_set:
-          - write:queue:edit
-          - write:queue:control
-          - write:manager:control
-          - read:status
-      new_role2:
-        scopes_add:
-          - write:queue:edit
-          - write:queue:control
-          - write:manager:control
-          - read:status
-"""
-
-config_test_all_default_roles = """
-authentication:
-    allow_anonymous_access: False
-    providers:
-        - provider: toy
-          authenticator: bluesky_httpserver.authenticators:DictionaryAuthenticator
-          args:
-              users_to_passwords:
-                  bob: bob_password
-                  alice: alice_password
-                  cara: cara_password
-                  tom: tom_password
-                  joe: joe_password
-api_access:
-  policy: bluesky_httpserver.authorization:DictionaryAPIAccessControl
-  args:
-    users:
-      bob:
-        roles: admin
-      alice:
-        roles: expert
-      cara:
-        roles: advanced
-      tom:
-        roles: user
-      joe:
-        roles: observer
-"""
+from .conftest import fastapi_server_ms, server_with_config  # noqa: F401
+from .conftest import request_to_json
 
+# Use libyaml bindings for faster serialization if available
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
-# fmt: on
-@pytest.mark.parametrize(
-    "cfg, access_cfg, single_user_access, public_access, token_access",
-    [
-        (config_toy_with_anonymous_access, authorization_dict, False, True, True),
-        (config_toy_without_anonymous_access, authorization_dict, False, False, True),
-        (config_toy_with_anonymous_access, "", False, True, False),
-        (config_toy_without_anonymous_access, "", False, False, False),
-        (config_noauth_with_anonymous_access, authorization_dict, True, True, False),
-        (config_noauth_without_anonymous_access, authorization_dict, True, False, False),
-        (config_noauth_with_anonymous_access, "", True, True, False),
-        (config_noauth_without_anonymous_access, "", True, False, False),
-        ("", authorization_dict, True, False, False),  # No authentication settings in config
-        ("", "", True, False, False),  # No config file
-    ],
-)
+
+def _dump_config(config):
+    """
+    Serialize the config dictionary to a string in YAML format. Returns empty string
+    if the config is empty (the config file is not created in this case).
+    """
+    return yaml.dump(config, Dumper=_YamlDumper) if config else ""
+
+
+config_noauth_with_anonymous_access = {"authentication": {"allow_anonymous_access": True}}
+
+config_noauth_without_anonymous_access = {"authentication": {"allow_anonymous_access": False}}
+
+config_noauth_single_user_api_key = {"authentication": {"single_user_api_key": "apikeyfromconfig"}}
+
+config_noauth_single_user_api_key_as_ev = {"authentication": {"single_user_api_key": "${CUSTOM_EV_FOR_API_KEY}"}}
+
+_provider_toy = {
+    "provider": "toy",
+    "authenticator": "bluesky_httpserver.authenticators:DictionaryAuthenticator",
+    "args": {
+        "users_to_passwords": {
+            "bob": "bob_password",
+            "alice": "alice_password",
+            "cara": "cara_password",
+            "tom": "tom_password",
+        },
+    },
+}
+
+config_toy_with_anonymous_access = {
+    "authentication": {"allow_anonymous_access": True, "providers": [_provider_toy]},
+}
+
+config_toy_without_anonymous_access = {
+    "authentication": {"allow_anonymous_access": False, "providers": [_provider_toy]},
+}
+
+authorization_dict = {
+    "api_access": {
+        "policy": "bluesky_httpserver.authorization:DictionaryAPIAccessControl",
+        "args": {
+            "users": {
+                "bob": {"roles": ["admin", "expert"]},
+                # A single role may be specified as a string or a list with one element.
+                "alice": {"roles": "user"},
+                "cara": {"roles": ["observer"]},
+            },
+        },
+    },
+}
+
+config_noauth_modify_default_roles = {
+    "authentication": {"allow_anonymous_access": True},
+    "api_access": {
+        "policy": "bluesky_httpserver.authorization:DictionaryAPIAccessControl",
+        "args": {
+            "roles": {
+                _DEFAULT_ROLE_SINGLE_USER: {
+                    "scopes_add": ["admin:apikeys", "admin:read:principals", "admin:metrics"],
+                    "scopes_remove": ["read:monitor"],
+                },
+                _DEFAULT_ROLE_PUBLIC: {
+                    "scopes_set": ["read:status", "read:queue", "read:history"],
+                },
+            },
+        },
+    },
+}
+
+authorization_modify_roles_for_users = {
+    "api_access": {
+        "policy": "bluesky_httpserver.authorization:DictionaryAPIAccessControl",
+        "args": {
+            "users": {
+                "bob": {"roles": ["admin", "expert"]},
+                "alice": {"roles": "user"},
+                "cara": {"roles": ["observer"]},
+            },
+            "roles": {
+                _DEFAULT_ROLE_ADMIN: {"scopes_add": "read:queue", "scopes_remove": "admin:metrics"},
+                _DEFAULT_ROLE_EXPERT: {"scopes_set": ["read:queue", "write:queue"]},
+                _DEFAULT_ROLE_USER: {"scopes_remove": ["read:console", "read:testing"]},
+                _DEFAULT_ROLE_OBSERVER: {"scopes_add": ["write:queue"]},
+            },
+        },
+    },
+}
+
+authorization_define_new_role = {
+    "api_access": {
+        "policy": "bluesky_httpserver.authorization:DictionaryAPIAccessControl",
+        "args": {
+            "users": {
+                "bob": {"roles": ["admin", "expert"]},
+                "alice": {"roles": ["observer", "new_role1"]},
+                "cara": {"roles": "new_role2"},
+                "tom": None,  # Same as if tom was not listed: tom can not log into the server.
+            },
+            # The new roles are identical, one is created using 'scope_set', the other using 'scope_add'.
+            #   Both methods should work identically.
+            "roles": {
+                "new_role1": {
+                    "scopes_set": [
+                        "write:queue:edit",
+                        "write:queue:control",
+                        "write:manager:control",
+                        "read:status",
+                    ],
+                },
+                "new_role2": {
+                    "scopes_add": [
+                        "write:queue:edit",
+                        "write:queue:control",
+                        "write:manager:control",
+                        "read:status",
+                    ],
+                },
+            },
+        },
+    },
+}
+
+config_test_all_default_roles = {
+    "authentication": {
+        "allow_anonymous_access": False,
+        "providers": [
+            {
+                "provider": "toy",
+                "authenticator": "bluesky_httpserver.authenticators:DictionaryAuthenticator",
+                "args": {
+                    "users_to_passwords": {
+                        "bob": "bob_password",
+                        "alice": "alice_password",
+                        "cara": "cara_password",
+                        "tom": "tom_password",
+                        "joe": "joe_password",
+                    },
+                },
+            },
+        ],
+    },
+    "api_access": {
+        "policy": "bluesky_httpserver.authorization:DictionaryAPIAccessControl",
+        "args": {
+            "users": {
+                "bob": {"roles": "admin"},
+                "alice": {"roles": "expert"},
+                "cara": {"roles": "advanced"},
+                "tom": {"roles": "user"},
+                "joe": {"roles": "observer"},
+            },
+        },
+    },
+}
+
+
+@dataclass
+class _AccessCase:
+    """
+    Expected behavior of the server for the configuration loaded by ``access_case`` fixture.
+    """
+
+    single_user_access: bool  # Access in 'single-user' mode
+    public_access: bool  # Public unauthenticated user works
+    token_access: bool  # Token is generated when logging in as 'bob'
+    providers_set: bool  # Authentication providers are listed in the config
+    api_access_set: bool  # Authorization policy is defined in the config
+
+
+def _make_access_case(cfg, access_cfg, single_user_access, public_access, token_access):
+    """
+    Merge the configs and return the tuple ``(config_file_str, expected_behavior)``.
+    """
+    config = {**cfg, **access_cfg}
+    expected_behavior = _AccessCase(
+        single_user_access=single_user_access,
+        public_access=public_access,
+        token_access=token_access,
+        providers_set="providers" in config.get("authentication", {}),
+        api_access_set="api_access" in config,
+    )
+    return _dump_config(config), expected_behavior
+
+
+# The configs are merged and serialized once when the module is imported.
 # fmt: off
-def test_authentication_and_authorization_01(
-    tmpdir,
-    monkeypatch,
-    re_manager,  # noqa: F811
-    fastapi_server_fs,  # noqa: F811
-    cfg,
-    access_cfg,
-    single_user_access,  # Access in 'single-user' mode
-    public_access,  # Public unauthenticated user works
-    token_access,
-):
+_access_case_params = [_make_access_case(*case_args) for case_args in [
+    # cfg, access_cfg, single_user_access, public_access, token_access
+    (config_toy_with_anonymous_access, authorization_dict, False, True, True),
+    (config_toy_without_anonymous_access, authorization_dict, False, False, True),
+    (config_toy_with_anonymous_access, {}, False, True, False),
+    (config_toy_without_anonymous_access, {}, False, False, False),
+    (config_noauth_with_anonymous_access, authorization_dict, True, True, False),
+    (config_noauth_without_anonymous_access, authorization_dict, True, False, False),
+    (config_noauth_with_anonymous_access, {}, True, True, False),
+    (config_noauth_without_anonymous_access, {}, True, False, False),
+    ({}, authorization_dict, True, False, False),  # No authentication settings in config
+    ({}, {}, True, False, False),  # No config file
+]]
+
+_access_case_ids = [
+    "toy-anonymous-policy",
+    "toy-no_anonymous-policy",
+    "toy-anonymous",
+    "toy-no_anonymous",
+    "noauth-anonymous-policy",
+    "noauth-no_anonymous-policy",
+    "noauth-anonymous",
+    "noauth-no_anonymous",
+    "policy_only",
+    "no_config",
+]
+# fmt: on
+
+
+@pytest.fixture(scope="module", params=_access_case_params, ids=_access_case_ids)
+def access_case_params(request):
     """
-    Basic test: attempt to log into the server configured using various combinations of settings.
+    Parameters for ``access_case`` fixture. The fixture has module scope, so that the tests
+    are grouped by configuration and the tests with the same configuration may reuse the app.
+    """
+    return request.param
+
+
+@pytest.fixture
+def access_case(access_case_params, server_with_config):  # noqa: F811
+    """
+    Load the server configured using various combinations of settings and return expected behavior.
+    The tests that use the fixture check the following behavior:
 
-    Tested behavior:
         - Public unauthenticated access is disabled by default. Can be enabled by setting
           'allow_anonymous_access' True in the config file. (It can also be set using EV, but
           this option is not tested here.)
@@ -244,44 +268,52 @@ def test_authentication_and_authorization_01(
         - Login with incorrect username or password does not work (token is not generated).
         - API can not be accessed using incorrect token or API key.
     """
-    config = cfg + access_cfg
-    providers_set = "providers" in config
-    api_access_set = "api_access" in config
+    config_file_str, expected_behavior = access_case_params
+
+    # The tests do not depend on the contents of the database
+    server_with_config(config_file_str, reuse=True)
+
+    return expected_behavior
 
-    if config:
-        setup_server_with_config_file(config_file_str=config, tmpdir=tmpdir, monkeypatch=monkeypatch)
-    fastapi_server_fs()
 
-    # Test if anonymous 'public' access works
+def test_authentication_and_authorization_01_public_access(re_manager, access_case):  # noqa: F811
+    """
+    Test if anonymous 'public' access works.
+    """
     resp1 = request_to_json("get", "/status", api_key=None)
-    if public_access:
+    if access_case.public_access:
         assert "msg" in resp1, pprint.pformat(resp1)
         assert "RE Manager" in resp1["msg"]
     else:
         assert "detail" in resp1, pprint.pformat(resp1)
         assert "Not enough permissions" in resp1["detail"]
 
-    # Make sure that the anonymous 'single-user' access is not allowed
+
+def test_authentication_and_authorization_01_single_user_access(re_manager, access_case):  # noqa: F811
+    """
+    Test if 'single-user' access is allowed only if no authentication providers are configured.
+    """
     resp2 = request_to_json("get", "/status")  # By default, the single user API key is sent
-    if single_user_access:
-        assert "msg" in resp2, pprint.pformat(resp1)
+    if access_case.single_user_access:
+        assert "msg" in resp2, pprint.pformat(resp2)
         assert "RE Manager" in resp2["msg"]
     else:
         assert "detail" in resp2, pprint.pformat(resp2)
         assert "Invalid API key" in resp2["detail"]
 
-    if api_access_set:
+
+def test_authentication_and_authorization_01_token_login(re_manager, access_case):  # noqa: F811
+    """
+    Login using valid username and password and access the server using the token.
+    """
+    if access_case.api_access_set:
         login_fail_msg = "Incorrect username or password"
     else:
         login_fail_msg = "User is not authorized to access the server"
-    login_fail_msg = login_fail_msg if providers_set else "Not Found"
+    login_fail_msg = login_fail_msg if access_case.providers_set else "Not Found"
 
-    # auth_fail_msg1 = "Incorrect username or password" if providers_set else "Not Found"
-    auth_fail_msg = "Incorrect username or password" if providers_set else "Not Found"
-
-    # Login using token: should work in all cases
     resp3 = request_to_json("post", "/auth/provider/toy/token", login=("bob", "bob_password"))
-    if token_access:
+    if access_case.token_access:
         assert "access_token" in resp3
         token = resp3["access_token"]
         resp4 = request_to_json("get", "/status", token=token)
@@ -291,6 +323,13 @@ def test_authentication_and_authorization_01(
         assert "detail" in resp3
         assert login_fail_msg in resp3["detail"]
 
+
+def test_authentication_and_authorization_01_invalid_credentials(access_case):
+    """
+    Login using incorrect username or password does not generate a token.
+    """
+    auth_fail_msg = "Incorrect username or password" if access_case.providers_set else "Not Found"
+
     # Login using incorrect username
     resp5 = request_to_json("post", "/auth/provider/toy/token", login=("incorrect_name", "bob_password"))
     assert "detail" in resp5
@@ -301,25 +340,26 @@ def test_authentication_and_authorization_01(
     assert "detail" in resp6
     assert auth_fail_msg in resp6["detail"]
 
-    # Try using invalid token
+
+def test_authentication_and_authorization_01_invalid_token(access_case):
+    """
+    API can not be accessed using invalid token.
+    """
     resp7 = request_to_json("get", "/status", token="INVALIDTOKEN")
     assert "detail" in resp7, pprint.pformat(resp7)
     assert "Could not validate credentials" in resp7["detail"]
 
 
 def test_authentication_and_authorization_02(
-    tmpdir,
-    monkeypatch,
     re_manager,  # noqa: F811
-    fastapi_server_fs,  # noqa: F811
+    server_with_config,  # noqa: F811
 ):
     """
     Check default scopes for all default roles. Each user is assigned a single role.
     Check that returned scopes match the default scopes.
     """
     config = config_test_all_default_roles
-    setup_server_with_config_file(config_file_str=config, tmpdir=tmpdir, monkeypatch=monkeypatch)
-    fastapi_server_fs()
+    server_with_config(_dump_config(config))
 
     username__to_role = {
         "bob": _DEFAULT_ROLE_ADMIN,
@@ -352,10 +392,9 @@ def test_authentication_and_authorization_02(
 ])
 # fmt:on
 def test_authentication_and_authorization_03(
-    tmpdir,
     monkeypatch,
     re_manager,  # noqa: F811
-    fastapi_server_fs,  # noqa: F811
+    server_with_config,  # noqa: F811
     config,
     set_ev,
 ):
@@ -368,8 +407,7 @@ def test_authentication_and_authorization_03(
     if set_ev:
         monkeypatch.setenv("CUSTOM_EV_FOR_API_KEY", api_key)
 
-    setup_server_with_config_file(config_file_str=config, tmpdir=tmpdir, monkeypatch=monkeypatch)
-    fastapi_server_fs()
+    server_with_config(_dump_config(config))
 
     resp1 = request_to_json("get", "/status", api_key=api_key)
     assert "msg" in resp1, pprint.pformat(resp1)
@@ -386,10 +424,8 @@ def test_authentication_and_authorization_03(
 
 
 def test_authentication_and_authorization_04(
-    tmpdir,
-    monkeypatch,
     re_manager,  # noqa: F811
-    fastapi_server_fs,  # noqa: F811
+    server_with_config,  # noqa: F811
 ):
     """
     Check default scopes for 'single-user' and public access. No authentication providers
@@ -397,8 +433,7 @@ def test_authentication_and_authorization_04(
     """
 
     config = config_noauth_with_anonymous_access
-    setup_server_with_config_file(config_file_str=config, tmpdir=tmpdir, monkeypatch=monkeypatch)
-    fastapi_server_fs()
+    server_with_config(_dump_config(config))
 
     # Check that both single-user access and public access work
     #   (by default 'api_key' is set to valid single-user API key)
@@ -424,10 +459,8 @@ def test_authentication_and_authorization_04(
 
 
 def test_authentication_and_authorization_05(
-    tmpdir,
-    monkeypatch,
     re_manager,  # noqa: F811
-    fastapi_server_fs,  # noqa: F811
+    server_with_config,  # noqa: F811
 ):
     """
     Check default scopes for 'single-user' and public access. No authentication providers
@@ -435,8 +468,7 @@ def test_authentication_and_authorization_05(
     """
 
     config = config_noauth_modify_default_roles
-    setup_server_with_config_file(config_file_str=config, tmpdir=tmpdir, monkeypatch=monkeypatch)
-    fastapi_server_fs()
+    server_with_config(_dump_config(config))
 
     # Check that both single-user access and public access work
     #   (by default 'api_key' is set to valid single-user API key)
@@ -464,10 +496,8 @@ def test_authentication_and_authorization_05(
 
 
 def test_authentication_and_authorization_06(
-    tmpdir,
-    monkeypatch,
     re_manager,  # noqa: F811
-    fastapi_server_fs,  # noqa: F811
+    server_with_config,  # noqa: F811
 ):
     """
     Check default scopes for logged in user. Test management of scopes when using authorization
@@ -476,11 +506,20 @@ def test_authentication_and_authorization_06(
     Verify that the scope cannot be extended.
     """
 
-    config = config_toy_without_anonymous_access + authorization_dict
-    setup_server_with_config_file(config_file_str=config, tmpdir=tmpdir, monkeypatch=monkeypatch)
-    fastapi_server_fs()
+    config = {**config_toy_without_anonymous_access, **authorization_dict}
+    server_with_config(_dump_config(config))
 
-    n_api_keys = 0
+    api_keys_generated = False
+
+    roles_all = {"bob": ["admin", "expert"], "alice": ["user"], "cara": ["observer"]}
+    scopes_all = {
+        username: frozenset().union(*(_DEFAULT_ROLES[role] for role in roles))
+        for username, roles in roles_all.items()
+    }
+
+    # Limited scopes for the API key generated based on the existing API key
+    new_scopes = ["read:status", "user:apikeys"]
+    new_scopes_set = frozenset(new_scopes)
 
     # Check that both single-user access and public access work
     #   (by default 'api_key' is set to valid single-user API key)
@@ -495,11 +534,8 @@ def test_authentication_and_authorization_06(
         assert "msg" in resp2, pprint.pformat(resp2)
         assert "RE Manager" in resp2["msg"]
 
-        roles_all = {"bob": ["admin", "expert"], "alice": ["user"], "cara": ["observer"]}
         roles_user = roles_all[username]
-        scopes_user = set()
-        for role in roles_user:
-            scopes_user = scopes_user | set(_DEFAULT_ROLES[role])
+        scopes_user = scopes_all[username]
 
         resp3 = request_to_json("get", "/auth/scopes", token=token)
         assert "roles" in resp3, pprint.pformat(resp3)
@@ -529,7 +565,6 @@ def test_authentication_and_authorization_06(
             assert "RE Manager" in resp5["msg"]
 
             # Generate the new API key based on the existing API key based on limited scopes
-            new_scopes = ["read:status", "user:apikeys"]
             resp6 = request_to_json(
                 "post", "/auth/apikey", json={"scopes": new_scopes, "expires_in": 900}, api_key=api_key
             )
@@ -543,7 +578,7 @@ def test_authentication_and_authorization_06(
             assert "roles" in resp6a, pprint.pformat(resp6a)
             assert "scopes" in resp6a, pprint.pformat(resp6a)
             assert resp6a["roles"] == roles_user
-            assert set(resp6a["scopes"]) == set(new_scopes)
+            assert set(resp6a["scopes"]) == new_scopes_set
 
             resp7 = request_to_json("get", "/status", api_key=api_key2)
             assert "msg" in resp7, pprint.pformat(resp7)
@@ -554,14 +589,14 @@ def test_authentication_and_authorization_06(
             assert "secret" in resp8, pprint.pformat(resp8)
             assert "note" in resp8, pprint.pformat(resp8)
             assert resp8["note"] is None
-            assert set(resp8["scopes"]) == set(new_scopes)
+            assert set(resp8["scopes"]) == new_scopes_set
             api_key3 = resp8["secret"]
 
             resp8a = request_to_json("get", "/auth/scopes", api_key=api_key3)
             assert "roles" in resp8a, pprint.pformat(resp8a)
             assert "scopes" in resp8a, pprint.pformat(resp8a)
             assert resp8a["roles"] == roles_user
-            assert set(resp8a["scopes"]) == set(new_scopes)
+            assert set(resp8a["scopes"]) == new_scopes_set
 
             resp9 = request_to_json("get", "/status", api_key=api_key3)
             assert "msg" in resp9, pprint.pformat(resp9)
@@ -574,15 +609,12 @@ def test_authentication_and_authorization_06(
             assert "detail" in resp10, pprint.pformat(resp10)
             assert "must be a subset of the allowed principal's scopes" in resp10["detail"]
 
-            n_api_keys += 1
+            api_keys_generated = True
 
         else:
             assert "detail" in resp4
             assert "Not enough permissions" in resp4["detail"]
 
-        if not n_api_keys:
-            assert False, "No API keys were generated during the test. The test may be incorrectly configured."
-
         resp11 = request_to_json("post", "/auth/provider/toy/token", login=("tom", "tom_password"))
         assert "detail" in resp11
         assert "User is not authorized to access the server" in resp11["detail"]
@@ -591,20 +623,19 @@ def test_authentication_and_authorization_06(
         assert "detail" in resp12
         assert "Incorrect username or password" in resp12["detail"]
 
+    assert api_keys_generated, "No API keys were generated. The test may be incorrectly configured."
+
 
 def test_authentication_and_authorization_07(
-    tmpdir,
-    monkeypatch,
     re_manager,  # noqa: F811
-    fastapi_server_fs,  # noqa: F811
+    server_with_config,  # noqa: F811
 ):
     """
     Modified scopes for logged in user.
     """
 
-    config = config_toy_with_anonymous_access + authorization_modify_roles_for_users
-    setup_server_with_config_file(config_file_str=config, tmpdir=tmpdir, monkeypatch=monkeypatch)
-    fastapi_server_fs()
+    config = {**config_toy_with_anonymous_access, **authorization_modify_roles_for_users}
+    server_with_config(_dump_config(config))
 
     for username in ("bob", "alice", "cara"):
         print(f"Testing access for the username {username!r}")
@@ -639,18 +670,15 @@ def test_authentication_and_authorization_07(
 
 
 def test_authentication_and_authorization_08(
-    tmpdir,
-    monkeypatch,
     re_manager,  # noqa: F811
-    fastapi_server_fs,  # noqa: F811
+    server_with_config,  # noqa: F811
 ):
     """
     Define a new role in the config file.
     """
 
-    config = config_toy_with_anonymous_access + authorization_define_new_role
-    setup_server_with_config_file(config_file_str=config, tmpdir=tmpdir, monkeypatch=monkeypatch)
-    fastapi_server_fs()
+    config = {**config_toy_with_anonymous_access, **authorization_define_new_role}
+    server_with_config(_dump_config(config))
 
     for username in ("alice", "cara"):
         print(f"Testing access for the username {username!r}")
@@ -684,43 +712,39 @@ def test_authentication_and_authorization_08(
 # ====================================================================================
 #                               RESOURCE ACCESS
 
-config_default_resource_access = """
-authentication:
-    providers:
-        - provider: toy
-          authenticator: bluesky_httpserver.authenticators:DictionaryAuthenticator
-          args:
-              users_to_passwords:
-                  bob: bob_password
-api_access:
-  policy: bluesky_httpserver.authorization:DictionaryAPIAccessControl
-  args:
-    users:
-      bob:
-        roles:
-          - admin
-          - expert
-"""
-
-resource_access_change_default = """
-resource_access:
-  policy: bluesky_httpserver.authorization:DefaultResourceAccessControl
-  args:
-    default_group: test_user
-"""
+config_default_resource_access = {
+    "authentication": {
+        "providers": [
+            {
+                "provider": "toy",
+                "authenticator": "bluesky_httpserver.authenticators:DictionaryAuthenticator",
+                "args": {"users_to_passwords": {"bob": "bob_password"}},
+            },
+        ],
+    },
+    "api_access": {
+        "policy": "bluesky_httpserver.authorization:DictionaryAPIAccessControl",
+        "args": {"users": {"bob": {"roles": ["admin", "expert"]}}},
+    },
+}
+
+resource_access_change_default = {
+    "resource_access": {
+        "policy": "bluesky_httpserver.authorization:DefaultResourceAccessControl",
+        "args": {"default_group": "test_user"},
+    },
+}
 
 
 # fmt: off
 @pytest.mark.parametrize("config, group", [
     (config_default_resource_access, _DEFAULT_RESOURCE_ACCESS_GROUP),
-    (config_default_resource_access + resource_access_change_default, "test_user"),
+    ({**config_default_resource_access, **resource_access_change_default}, "test_user"),
 ])
 # fmt: on
 def test_resource_access_01(
-    tmpdir,
-    monkeypatch,
     re_manager,  # noqa: F811
-    fastapi_server_fs,  # noqa: F811
+    server_with_config,  # noqa: F811
     config,
     group,
 ):
@@ -728,8 +752,7 @@ def test_resource_access_01(
     DefaultResourceAccessControl: Test that the correct group name is used in API calls
     that require group name, e.g. '/queue/item/add' API.
     """
-    setup_server_with_config_file(config_file_str=config, tmpdir=tmpdir, monkeypatch=monkeypatch)
-    fastapi_server_fs()
+    server_with_config(_dump_config(config))
 
     username, password = "bob", "bob_password"
 
@@ -27,7 +27,17 @@ from bluesky_httpserver.authorization._defaults import (
     _DEFAULT_USERNAME_SINGLE_USER,
 )
 from bluesky_httpserver.config_schemas.loading import ConfigError
-from bluesky_httpserver.tests.conftest import request_to_json, setup_server_with_config_file
+from bluesky_httpserver.tests.conftest import (
+    request_to_json,
+    setup_server_with_config_file,
+    xdist_worker_port,
+    xdist_worker_process_name,
+)
+
+# Worker ports start from 60101, so that they are different from the port 60002 used in the tests
+#   as an example of the wrong port.
+ACCESS_API_SERVER_PORT = xdist_worker_port(60001, 60101)
+_access_api_server_url = f"http://localhost:{ACCESS_API_SERVER_PORT}"
 
 # ====================================================================================
 #                                API ACCESS POLICIES
@@ -219,17 +229,18 @@ def test_DictionaryAPIAccessControl_02(params, existing_scopes, missing_scopes):
 def access_api_server(xprocess):
     server_module = "bluesky_httpserver.tests.access_api_server.api_server"
     server_address = "localhost"
-    server_port = 60001
+    server_port = ACCESS_API_SERVER_PORT
+    process_name = xdist_worker_process_name("access_api_server")
 
     class Starter(ProcessStarter):
         pattern = "Access API Server started successfully"
         args = f"uvicorn --host={server_address} --port {server_port} {server_module}:app".split()
 
-    xprocess.ensure("access_api_server", Starter)
+    xprocess.ensure(process_name, Starter)
 
     yield
 
-    xprocess.getinfo("access_api_server").terminate()
+    xprocess.getinfo(process_name).terminate()
 
 
 _user_access_info_1 = {
@@ -320,10 +331,10 @@ def test_ServerBasedAPIAccessControl_01(access_api_server, n_requests, user_info
     ServerBasedAPIAccessControl: basic test
     """
     groups = user_access_info_to_groups(user_info)
-    requests.post("http://localhost:60001/test/set_info", json=groups)
+    requests.post(f"{_access_api_server_url}/test/set_info", json=groups)
 
     ac_manager = ServerBasedAPIAccessControl(
-        server="localhost", port=60001, update_period=2, http_timeout=1, instrument="tst"
+        server="localhost", port=ACCESS_API_SERVER_PORT, update_period=2, http_timeout=1, instrument="tst"
     )
 
     # Read user info from the API server (once)
@@ -360,10 +371,10 @@ def test_ServerBasedAPIAccessControl_02(access_api_server):
     ServerBasedAPIAccessControl: periodic updates
     """
     groups = user_access_info_to_groups(_user_access_info_1)
-    requests.post("http://localhost:60001/test/set_info", json=groups)
+    requests.post(f"{_access_api_server_url}/test/set_info", json=groups)
 
     ac_manager = ServerBasedAPIAccessControl(
-        server="localhost", port=60001, update_period=2, http_timeout=1, instrument="tst"
+        server="localhost", port=ACCESS_API_SERVER_PORT, update_period=2, http_timeout=1, instrument="tst"
     )
 
     stop_loop = False
@@ -391,7 +402,7 @@ def test_ServerBasedAPIAccessControl_02(access_api_server):
     groups2 = copy.deepcopy(groups)
     groups2["user"].pop("tom")
     groups2["admin"].pop("bob")
-    requests.post("http://localhost:60001/test/set_info", json=groups2)
+    requests.post(f"{_access_api_server_url}/test/set_info", json=groups2)
 
     ttime.sleep(3)
 
@@ -407,9 +418,9 @@ def test_ServerBasedAPIAccessControl_02(access_api_server):
     # Wrong port (fails to connect)
     ({"port": 60002, "instrument": "tst"}, 0),
     # Wrong instrument
-    ({"port": 60001, "instrument": "nex"}, 0),
+    ({"port": ACCESS_API_SERVER_PORT, "instrument": "nex"}, 0),
     # Long response delay (request timeout)
-    ({"port": 60001, "instrument": "tst"}, 10),
+    ({"port": ACCESS_API_SERVER_PORT, "instrument": "tst"}, 10),
 ])
 # fmt: on
 def test_ServerBasedAPIAccessControl_03(access_api_server, ac_params, delay):
@@ -417,9 +428,9 @@ def test_ServerBasedAPIAccessControl_03(access_api_server, ac_params, delay):
     ServerBasedAPIAccessControl: expiration of user access data
     """
     groups = user_access_info_to_groups(_user_access_info_1)
-    requests.post("http://localhost:60001/test/set_info", json=groups)
+    requests.post(f"{_access_api_server_url}/test/set_info", json=groups)
     if delay:
-        requests.post("http://localhost:60001/test/set_delay", json={"delay": delay})
+        requests.post(f"{_access_api_server_url}/test/set_delay", json={"delay": delay})
 
     ac_manager = ServerBasedAPIAccessControl(
         server="localhost",
@@ -461,7 +472,7 @@ def test_ServerBasedAPIAccessControl_03(access_api_server, ac_params, delay):
     th.join()
 
 
-config_server_based_access_control = """
+config_server_based_access_control = f"""
 authentication:
     providers:
         - provider: toy
@@ -477,14 +488,14 @@ api_access:
     args:
         instrument: tst
         server: localhost
-        port: 60001
+        port: {ACCESS_API_SERVER_PORT}
         update_period: 10
         expiration_period: 60
 """
 
 
 def test_ServerBasedAPIAccessControl_04(
-    tmpdir,
+    tmp_path_factory,
     monkeypatch,
     access_api_server,  # noqa: F811
     re_manager,  # noqa: F811
@@ -494,10 +505,12 @@ def test_ServerBasedAPIAccessControl_04(
     ServerBasedAPIAccessControl: test if the policy works correctly with the server.
     """
     groups = user_access_info_to_groups(_user_access_info_1)
-    requests.post("http://localhost:60001/test/set_info", json=groups)
+    requests.post(f"{_access_api_server_url}/test/set_info", json=groups)
 
     config = config_server_based_access_control
-    setup_server_with_config_file(config_file_str=config, tmpdir=tmpdir, monkeypatch=monkeypatch)
+    setup_server_with_config_file(
+        config_file_str=config, tmp_path_factory=tmp_path_factory, monkeypatch=monkeypatch
+    )
     fastapi_server_fs()
 
     for username in ("alice", "cara"):
@@ -36,7 +36,7 @@ api_access:
 
 
 def test_api_auth_post_apikey_01(
-    tmpdir,
+    tmp_path_factory,
     monkeypatch,
     re_manager,  # noqa: F811
     fastapi_server_fs,  # noqa: F811
@@ -45,7 +45,9 @@ def test_api_auth_post_apikey_01(
     ``/auth/apikey`` (POST): basic tests.
     """
 
-    setup_server_with_config_file(config_file_str=config_toy_test, tmpdir=tmpdir, monkeypatch=monkeypatch)
+    setup_server_with_config_file(
+        config_file_str=config_toy_test, tmp_path_factory=tmp_path_factory, monkeypatch=monkeypatch
+    )
     fastapi_server_fs()
 
     resp1 = request_to_json("post", "/auth/provider/toy/token", login=("bob", "bob_password"))
@@ -131,7 +133,7 @@ def test_api_auth_post_apikey_01(
 
 
 def test_api_auth_get_apikey_01(
-    tmpdir,
+    tmp_path_factory,
     monkeypatch,
     re_manager,  # noqa: F811
     fastapi_server_fs,  # noqa: F811
@@ -140,7 +142,9 @@ def test_api_auth_get_apikey_01(
     ``/auth/apikey`` (GET): basic tests.
     """
 
-    setup_server_with_config_file(config_file_str=config_toy_test, tmpdir=tmpdir, monkeypatch=monkeypatch)
+    setup_server_with_config_file(
+        config_file_str=config_toy_test, tmp_path_factory=tmp_path_factory, monkeypatch=monkeypatch
+    )
     fastapi_server_fs()
 
     resp1 = request_to_json("post", "/auth/provider/toy/token", login=("bob", "bob_password"))
@@ -166,7 +170,7 @@ def test_api_auth_get_apikey_01(
 
 
 def test_api_auth_delete_apikey_01(
-    tmpdir,
+    tmp_path_factory,
     monkeypatch,
     re_manager,  # noqa: F811
     fastapi_server_fs,  # noqa: F811
@@ -177,7 +181,9 @@ def test_api_auth_delete_apikey_01(
     Test if the case when the API key used for authentication is successfully deleted.
     """
 
-    setup_server_with_config_file(config_file_str=config_toy_test, tmpdir=tmpdir, monkeypatch=monkeypatch)
+    setup_server_with_config_file(
+        config_file_str=config_toy_test, tmp_path_factory=tmp_path_factory, monkeypatch=monkeypatch
+    )
     fastapi_server_fs()
 
     resp1 = request_to_json("post", "/auth/provider/toy/token", login=("bob", "bob_password"))
@@ -208,7 +214,7 @@ def test_api_auth_delete_apikey_01(
 
 
 def test_api_auth_scopes_01(
-    tmpdir,
+    tmp_path_factory,
     monkeypatch,
     re_manager,  # noqa: F811
     fastapi_server_fs,  # noqa: F811
@@ -217,7 +223,9 @@ def test_api_auth_scopes_01(
     ``/auth/scopes``: basic tests.
     """
 
-    setup_server_with_config_file(config_file_str=config_toy_test, tmpdir=tmpdir, monkeypatch=monkeypatch)
+    setup_server_with_config_file(
+        config_file_str=config_toy_test, tmp_path_factory=tmp_path_factory, monkeypatch=monkeypatch
+    )
     fastapi_server_fs()
 
     user_roles = {"admin", "expert"}
@@ -237,7 +245,7 @@ def test_api_auth_scopes_01(
 
 
 def test_api_auth_session_refresh_01(
-    tmpdir,
+    tmp_path_factory,
     monkeypatch,
     re_manager,  # noqa: F811
     fastapi_server_fs,  # noqa: F811
@@ -246,7 +254,9 @@ def test_api_auth_session_refresh_01(
     ``/auth/session/refresh``: basic tests.
     """
 
-    setup_server_with_config_file(config_file_str=config_toy_test, tmpdir=tmpdir, monkeypatch=monkeypatch)
+    setup_server_with_config_file(
+        config_file_str=config_toy_test, tmp_path_factory=tmp_path_factory, monkeypatch=monkeypatch
+    )
     fastapi_server_fs()
 
     resp1 = request_to_json("post", "/auth/provider/toy/token", login=("bob", "bob_password"))
@@ -266,7 +276,7 @@ def test_api_auth_session_refresh_01(
 
 
 def test_api_auth_whoami_01(
-    tmpdir,
+    tmp_path_factory,
     monkeypatch,
     re_manager,  # noqa: F811
     fastapi_server_fs,  # noqa: F811
@@ -275,7 +285,9 @@ def test_api_auth_whoami_01(
     ``/auth/whoami``: basic tests.
     """
 
-    setup_server_with_config_file(config_file_str=config_toy_test, tmpdir=tmpdir, monkeypatch=monkeypatch)
+    setup_server_with_config_file(
+        config_file_str=config_toy_test, tmp_path_factory=tmp_path_factory, monkeypatch=monkeypatch
+    )
     fastapi_server_fs()
 
     resp1 = request_to_json("post", "/auth/provider/toy/token", login=("bob", "bob_password"))
@@ -298,7 +310,7 @@ def test_api_auth_whoami_01(
 
 
 def test_api_auth_session_revoke_01(
-    tmpdir,
+    tmp_path_factory,
     monkeypatch,
     re_manager,  # noqa: F811
     fastapi_server_fs,  # noqa: F811
@@ -307,7 +319,9 @@ def test_api_auth_session_revoke_01(
     ``/auth/session/revoke``: basic tests.
     """
 
-    setup_server_with_config_file(config_file_str=config_toy_test, tmpdir=tmpdir, monkeypatch=monkeypatch)
+    setup_server_with_config_file(
+        config_file_str=config_toy_test, tmp_path_factory=tmp_path_factory, monkeypatch=monkeypatch
+    )
     fastapi_server_fs()
 
     resp1 = request_to_json("post", "/auth/provider/toy/token", login=("bob", "bob_password"))
@@ -336,7 +350,7 @@ def test_api_auth_session_revoke_01(
 
 
 def test_api_auth_logout_01(
-    tmpdir,
+    tmp_path_factory,
     monkeypatch,
     re_manager,  # noqa: F811
     fastapi_server_fs,  # noqa: F811
@@ -345,7 +359,9 @@ def test_api_auth_logout_01(
     ``/auth/logout``: basic tests.
     """
 
-    setup_server_with_config_file(config_file_str=config_toy_test, tmpdir=tmpdir, monkeypatch=monkeypatch)
+    setup_server_with_config_file(
+        config_file_str=config_toy_test, tmp_path_factory=tmp_path_factory, monkeypatch=monkeypatch
+    )
     fastapi_server_fs()
 
     resp1 = request_to_json("post", "/auth/logout", api_key=None)
@@ -353,7 +369,7 @@ def test_api_auth_logout_01(
 
 
 def test_api_admin_auth_principal_01(
-    tmpdir,
+    tmp_path_factory,
     monkeypatch,
     re_manager,  # noqa: F811
     fastapi_server_fs,  # noqa: F811
@@ -362,7 +378,9 @@ def test_api_admin_auth_principal_01(
     ``/auth/principal``, ``/auth/principal/<principal-UUID>``: basic tests.
     """
 
-    setup_server_with_config_file(config_file_str=config_toy_test, tmpdir=tmpdir, monkeypatch=monkeypatch)
+    setup_server_with_config_file(
+        config_file_str=config_toy_test, tmp_path_factory=tmp_path_factory, monkeypatch=monkeypatch
+    )
     fastapi_server_fs()
 
     # Login with admin access
@@ -397,7 +415,7 @@ def test_api_admin_auth_principal_01(
 
 
 def test_api_admin_auth_principal_apikey_01(
-    tmpdir,
+    tmp_path_factory,
     monkeypatch,
     re_manager,  # noqa: F811
     fastapi_server_fs,  # noqa: F811
@@ -406,7 +424,9 @@ def test_api_admin_auth_principal_apikey_01(
     ``/auth/principal/<principal-UUID>/apikey``: basic tests.
     """
 
-    setup_server_with_config_file(config_file_str=config_toy_test, tmpdir=tmpdir, monkeypatch=monkeypatch)
+    setup_server_with_config_file(
+        config_file_str=config_toy_test, tmp_path_factory=tmp_path_factory, monkeypatch=monkeypatch
+    )
     fastapi_server_fs()
 
     # Login with admin access
@@ -40,7 +40,9 @@ qserver_zmq_configuration:
 # fmt: off
 @pytest.mark.parametrize("test_mode", ["none", "ev", "cfg_file", "both"])
 # fmt: on
-def test_http_server_secure_1(monkeypatch, tmpdir, re_manager_cmd, fastapi_server_fs, test_mode):  # noqa: F811
+def test_http_server_secure_1(
+    monkeypatch, tmp_path_factory, re_manager_cmd, fastapi_server_fs, test_mode  # noqa: F811
+):
     """
     Test operation of HTTP server with enabled encryption. Security of HTTP server can be enabled
     only by setting the environment variable to the value of the public key.
@@ -58,13 +60,17 @@ def test_http_server_secure_1(monkeypatch, tmpdir, re_manager_cmd, fastapi_serve
     elif test_mode == "cfg_file":
         monkeypatch.setenv("QSERVER_ZMQ_PRIVATE_KEY_FOR_SERVER", private_key)  # RE Manager
         setup_server_with_config_file(
-            config_file_str=_config_public_key.format(public_key), tmpdir=tmpdir, monkeypatch=monkeypatch
+            config_file_str=_config_public_key.format(public_key),
+            tmp_path_factory=tmp_path_factory,
+            monkeypatch=monkeypatch,
         )
         set_qserver_zmq_public_key(monkeypatch, server_public_key=public_key)  # For test functions
     elif test_mode == "both":
         monkeypatch.setenv("QSERVER_ZMQ_PRIVATE_KEY_FOR_SERVER", private_key)  # RE Manager
         setup_server_with_config_file(
-            config_file_str=_config_public_key.format(public_key), tmpdir=tmpdir, monkeypatch=monkeypatch
+            config_file_str=_config_public_key.format(public_key),
+            tmp_path_factory=tmp_path_factory,
+            monkeypatch=monkeypatch,
         )
         monkeypatch.setenv("QSERVER_ZMQ_PUBLIC_KEY", "abc")  # IGNORED
         set_qserver_zmq_public_key(monkeypatch, server_public_key=public_key)  # For test functions
@@ -122,7 +128,7 @@ qserver_zmq_configuration:
 @pytest.mark.parametrize("option", ["ev", "cfg_file", "both"])
 # fmt: on
 def test_http_server_set_zmq_address_1(
-    monkeypatch, tmpdir, re_manager_cmd, fastapi_server_fs, option  # noqa: F811
+    monkeypatch, tmp_path_factory, re_manager_cmd, fastapi_server_fs, option  # noqa: F811
 ):
     """
     Test if ZMQ address of RE Manager is passed to the HTTP server using 'QSERVER_ZMQ_ADDRESS_CONTROL'
@@ -141,7 +147,7 @@ def test_http_server_set_zmq_address_1(
     elif option in ("cfg_file", "both"):
         setup_server_with_config_file(
             config_file_str=_config_zmq_address.format(zmq_control_address, zmq_info_address),
-            tmpdir=tmpdir,
+            tmp_path_factory=tmp_path_factory,
             monkeypatch=monkeypatch,
         )
         if option == "both":
@@ -239,12 +245,14 @@ server_configuration:
 # fmt: off
 @pytest.mark.parametrize("option", ["ev", "cfg_file", "both"])
 # fmt: on
-def test_http_server_custom_routers_1(tmpdir, monkeypatch, re_manager, fastapi_server_fs, option):  # noqa: F811
+def test_http_server_custom_routers_1(
+    tmp_path, tmp_path_factory, monkeypatch, re_manager, fastapi_server_fs, option  # noqa: F811
+):
     """
     Test if custom routers can be passed to the server using EV and config file and if settings in config file
     override the settings passed as EV (if both are used).
     """
-    dir_mod_root = os.path.join(tmpdir, "mod_dir")
+    dir_mod_root = os.path.join(tmp_path, "mod_dir")
     dir_submod = os.path.join(dir_mod_root, "submod_dir")
 
     os.makedirs(dir_mod_root, exist_ok=True)
@@ -263,7 +271,9 @@ def test_http_server_custom_routers_1(tmpdir, monkeypatch, re_manager, fastapi_s
 
     if option in ("cfg_file", "both"):
         config = _config_routers.format(routers[0], routers[1])
-        setup_server_with_config_file(config_file_str=config, tmpdir=tmpdir, monkeypatch=monkeypatch)
+        setup_server_with_config_file(
+            config_file_str=config, tmp_path_factory=tmp_path_factory, monkeypatch=monkeypatch
+        )
         if option == "both":
             monkeypatch.setenv("QSERVER_HTTP_CUSTOM_ROUTERS", "non.existing:router")
     elif option == "ev":